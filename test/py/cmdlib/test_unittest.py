@@ -116,6 +116,43 @@ class TestLUTestDelay(CmdlibTestCase):
     self.rpc.call_test_delay.assert_called_once_with([node1.uuid, node2.uuid],
                                                      DELAY_DURATION)
 
+  def _UseStubOnlyRpc(self, default=None):
+    self.rpc = CreateRpcRunnerStub(default=default)
+    # the processor keeps the runner it was created with
+    self.mcpu.rpc = self.rpc
+
+  def testStubOnlyRpcDefault(self):
+    self._UseStubOnlyRpc(default=self.RpcResultsBuilder()
+                                   .AddSuccessfulNode(self.master)
+                                   .Build())
+    op = opcodes.OpTestDelay(duration=DELAY_DURATION,
+                             on_node_uuids=[self.master_uuid])
+
+    self.ExecOpCode(op)
+
+  def testStubOnlyRpcStubbedCall(self):
+    self._UseStubOnlyRpc()
+    calls = []
+
+    def _TestDelay(node_uuids, duration):
+      calls.append((node_uuids, duration))
+      return self.RpcResultsBuilder() \
+        .AddFailedNode(self.master) \
+        .Build()
+
+    self.rpc.call_test_delay = _TestDelay
+    op = opcodes.OpTestDelay(duration=DELAY_DURATION,
+                             on_node_uuids=[self.master_uuid])
+
+    self.ExecOpCodeExpectOpExecError(op)
+    self.assertEqual(calls, [([self.master_uuid], DELAY_DURATION)])
+
+  def testStubOnlyRpcUnknownCall(self):
+    self._UseStubOnlyRpc()
+
+    self.assertRaises(AttributeError, setattr, self.rpc, "call_test_dealy",
+                      None)
+
 
 class TestLUTestAllocator(CmdlibTestCase):
   def setUp(self):
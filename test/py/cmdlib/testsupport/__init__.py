@@ -42,7 +42,7 @@ from cmdlib.testsupport.netutils_mock import patchNetutils, HostnameMock
 from cmdlib.testsupport.processor_mock import ProcessorMock
 from cmdlib.testsupport.pathutils_mock import patchPathutils
 from cmdlib.testsupport.rpc_runner_mock import CreateRpcRunnerMock, \
-  RpcResultsBuilder
+  CreateRpcRunnerStub, RpcResultsBuilder
 from cmdlib.testsupport.ssh_mock import patchSsh
 from cmdlib.testsupport.wconfd_mock import WConfdMock
 
@@ -50,6 +50,7 @@ __all__ = ["CmdlibTestCase",
            "withLockedLU",
            "ConfigMock",
            "CreateRpcRunnerMock",
+           "CreateRpcRunnerStub",
            "HostnameMock",
            "patchIAllocator",
            "patchUtils",
@@ -39,6 +39,34 @@ from ganeti.rpc import node as rpc
 from cmdlib.testsupport.util import patchModule
 
 
+# The public methods of L{rpc.RpcRunner}, stubbed by L{_RpcRunnerStub}
+_RPC_RUNNER_METHODS = frozenset(
+  name for name in dir(rpc.RpcRunner)
+  if not name.startswith("_") and callable(getattr(rpc.RpcRunner, name)))
+
+
+class _RpcRunnerStub(object):
+  """Lightweight stand-in for L{rpc.RpcRunner} without call tracking.
+
+  Only the public methods of L{rpc.RpcRunner} can be set, so assigning a
+  misspelled RPC call fails instead of being silently ignored.
+
+  """
+  __slots__ = sorted(_RPC_RUNNER_METHODS)
+
+  def __init__(self, default):
+    """Constructor.
+
+    @param default: the value returned by all RPC calls not stubbed otherwise
+
+    """
+    def _StubRpcCall(*_, **__):
+      return default
+
+    for name in self.__slots__:
+      setattr(self, name, _StubRpcCall)
+
+
 def CreateRpcRunnerMock():
   """Creates a new L{mock.MagicMock} tailored for L{rpc.RpcRunner}
 
@@ -47,6 +75,21 @@ def CreateRpcRunnerMock():
   return ret
 
 
+def CreateRpcRunnerStub(default=None):
+  """Creates a lightweight stand-in for L{rpc.RpcRunner}.
+
+  Unlike L{CreateRpcRunnerMock}, the returned object does not record any
+  invocations. All public L{rpc.RpcRunner} methods return C{default}; assign
+  plain functions to its attributes to stub specific calls.
+
+  @param default: the value returned by all RPC calls not stubbed otherwise,
+        e.g. a dict built with L{RpcResultsBuilder}
+  @rtype: L{_RpcRunnerStub}
+
+  """
+  return _RpcRunnerStub(default)
+
+
 class RpcResultsBuilder(object):
   """Helper class which assists in constructing L{rpc.RpcResult} objects.
 
@@ -72,6 +115,12 @@ class RpcResultsBuilder(object):
         .Build()
 
   """
+  __slots__ = [
+    "_cfg",
+    "_use_node_names",
+    "_results",
+    "_id_cache",
+    ]
 
   def __init__(self, cfg=None, use_node_names=False):
     """Constructor.
@@ -84,55 +133,119 @@ class RpcResultsBuilder(object):
     """
     self._cfg = cfg
     self._use_node_names = use_node_names
-    self._results = []
+    self._results = {}
+    self._id_cache = {}
 
   def _GetNode(self, node_id):
-    if isinstance(node_id, objects.Node):
-      return node_id
-
     node = None
     if self._cfg is not None:
-      node = self._cfg.GetNodeInfo(node_id)
-      if node is None:
-        node = self._cfg.GetNodeInfoByName(node_id)
+      node = self._LookupNode(node_id, self._cfg.GetNodeInfo,
+                              self._cfg.GetNodeInfoByName)
 
-    assert node is not None, "Failed to find '%s' in configuration" % node_id
+    if node is None:
+      raise AssertionError("Failed to find '%s' in configuration" % node_id)
     return node
 
-  def _GetNodeId(self, node_id):
-    node = self._GetNode(node_id)
+  def _LookupNode(self, node_id, by_uuid_fn, by_name_fn):
+    """Looks up a node by UUID or name.
+
+    Results keyed by node name are usually built from node names, so the
+    lookup matching the mode of the builder is tried first and the other one
+    as a fallback.
+
+    @param by_uuid_fn: returns the node for a UUID, or C{None}
+    @param by_name_fn: returns the node for a name, or C{None}
+    @rtype: L{objects.Node}
+    @return: the node, or C{None} if neither lookup found it
+
+    """
+    if self._use_node_names:
+      lookup_fns = (by_name_fn, by_uuid_fn)
+    else:
+      lookup_fns = (by_uuid_fn, by_name_fn)
+
+    for fn in lookup_fns:
+      node = fn(node_id)
+      if node is not None:
+        return node
+    return None
+
+  def _GetIdOfNode(self, node):
     if self._use_node_names:
       return node.name
     else:
       return node.uuid
 
+  def _GetNodeId(self, node_id):
+    if isinstance(node_id, objects.Node):
+      return self._GetIdOfNode(node_id)
+
+    # Node UUIDs and names are resolved through the configuration only once
+    try:
+      return self._id_cache[node_id]
+    except KeyError:
+      result = self._GetIdOfNode(self._GetNode(node_id))
+      self._id_cache[node_id] = result
+      return result
+
+  def _PrefetchNodeIds(self, node_ids):
+    """Resolves many node UUIDs/names with a single configuration query.
+
+    The resolved ids are stored in the id cache; ids which cannot be
+    resolved are left to L{_GetNodeId}, which reports them.
+
+    """
+    missing = [node_id for node_id in node_ids
+               if not isinstance(node_id, objects.Node) and
+               node_id not in self._id_cache]
+    if not missing or self._cfg is None:
+      return
+
+    nodes = self._cfg.GetAllNodesInfo()
+    nodes_by_name = {}
+
+    def _GetNodeByName(name):
+      # Only index the nodes by name once a lookup by name is needed
+      if not nodes_by_name:
+        nodes_by_name.update((node.name, node) for node in nodes.values())
+      return nodes_by_name.get(name)
+
+    for node_id in missing:
+      node = self._LookupNode(node_id, nodes.get, _GetNodeByName)
+      if node is not None:
+        self._id_cache[node_id] = self._GetIdOfNode(node)
+
   def CreateSuccessfulNodeResult(self, node, data=None):
     """@see L{RpcResultsBuilder}
 
     @param node: @see L{RpcResultsBuilder}.
     @type data: dict
-    @param data: the data as returned by the RPC
+    @param data: the data as returned by the RPC; if C{None}, a new empty
+          dict is used for each result
     @rtype: L{rpc.RpcResult}
     """
     if data is None:
       data = {}
     return rpc.RpcResult(data=(True, data), node=self._GetNodeId(node))
 
-  def CreateFailedNodeResult(self, node):
+  def CreateFailedNodeResult(self, node, offline=False):
     """@see L{RpcResultsBuilder}
 
     @param node: @see L{RpcResultsBuilder}.
+    @type offline: bool
+    @param offline: whether the failure is due to the node being offline
     @rtype: L{rpc.RpcResult}
     """
-    return rpc.RpcResult(failed=True, node=self._GetNodeId(node))
+    return rpc.RpcResult(failed=True, offline=offline,
+                         node=self._GetNodeId(node))
 
   def CreateOfflineNodeResult(self, node):
-    """@see L{RpcResultsBuilder}
+    """@see L{CreateFailedNodeResult}
 
     @param node: @see L{RpcResultsBuilder}.
     @rtype: L{rpc.RpcResult}
     """
-    return rpc.RpcResult(failed=True, offline=True, node=self._GetNodeId(node))
+    return self.CreateFailedNodeResult(node, offline=True)
 
   def CreateErrorNodeResult(self, node, error_msg=None):
     """@see L{RpcResultsBuilder}
@@ -151,17 +264,40 @@ class RpcResultsBuilder(object):
     @return: self for chaining
 
     """
-    self._results.append(self.CreateSuccessfulNodeResult(node, data))
+    result = self.CreateSuccessfulNodeResult(node, data)
+    self._results[result.node] = result
+    return self
+
+  def AddSuccessfulNodes(self, items):
+    """Adds successful results for many nodes at once.
+
+    Nodes given by UUID or name are looked up in a single
+    L{ganeti.config.ConfigWriter.GetAllNodesInfo} query before the results
+    are created. Unknown nodes still go through the per-node lookups, which
+    report them. As that query returns all nodes of the cluster, this only
+    pays off if a good part of the cluster's nodes is added.
+
+    @type items: iterable of tuples
+    @param items: (node, data) pairs, @see L{CreateSuccessfulNode}
+    @rtype: L{RpcResultsBuilder}
+    @return: self for chaining
+
+    """
+    items = list(items)
+    self._PrefetchNodeIds([node for (node, _) in items])
+    for (node, data) in items:
+      self.AddSuccessfulNode(node, data)
     return self
 
-  def AddFailedNode(self, node):
+  def AddFailedNode(self, node, offline=False):
     """@see L{CreateFailedNode}
 
     @rtype: L{RpcResultsBuilder}
     @return: self for chaining
 
     """
-    self._results.append(self.CreateFailedNodeResult(node))
+    result = self.CreateFailedNodeResult(node, offline=offline)
+    self._results[result.node] = result
     return self
 
   def AddOfflineNode(self, node):
@@ -171,8 +307,7 @@ class RpcResultsBuilder(object):
     @return: self for chaining
 
     """
-    self._results.append(self.CreateOfflineNodeResult(node))
-    return self
+    return self.AddFailedNode(node, offline=True)
 
   def AddErrorNode(self, node, error_msg=None):
     """@see L{CreateErrorNode}
@@ -181,7 +316,8 @@ class RpcResultsBuilder(object):
     @return: self for chaining
 
     """
-    self._results.append(self.CreateErrorNodeResult(node, error_msg=error_msg))
+    result = self.CreateErrorNodeResult(node, error_msg=error_msg)
+    self._results[result.node] = result
     return self
 
   def Build(self):
@@ -189,7 +325,7 @@ class RpcResultsBuilder(object):
 
     @rtype: dict
     """
-    return dict((result.node, result) for result in self._results)
+    return dict(self._results)
 
 
 # pylint: disable=C0103
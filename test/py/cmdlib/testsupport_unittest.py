@@ -0,0 +1,114 @@
+#!/usr/bin/python3
+#
+
+# Copyright (C) 2026 the Ganeti project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+# IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED
+# TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+# PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Tests for the cmdlib test support helpers"""
+
+import unittest
+from unittest import mock
+
+from cmdlib.testsupport.rpc_runner_mock import RpcResultsBuilder
+from testutils.config_mock import ConfigMock
+
+import testutils
+
+
+class TestRpcResultsBuilder(unittest.TestCase):
+  def setUp(self):
+    self.cfg = ConfigMock()
+    self.master = self.cfg.GetMasterNodeInfo()
+
+  def _CheckNodeIdResolvedOnce(self, node_id, use_node_names):
+    builder = RpcResultsBuilder(cfg=self.cfg, use_node_names=use_node_names)
+
+    with mock.patch.object(self.cfg, "GetNodeInfo",
+                           wraps=self.cfg.GetNodeInfo) as get_node_info:
+      with mock.patch.object(self.cfg, "GetNodeInfoByName",
+                             wraps=self.cfg.GetNodeInfoByName) as get_by_name:
+        first = builder.CreateSuccessfulNodeResult(node_id)
+        second = builder.CreateFailedNodeResult(node_id)
+
+    self.assertEqual(first.node, second.node)
+    self.assertEqual(get_node_info.call_count + get_by_name.call_count, 1)
+    return first.node
+
+  def testNodeUuidResolvedOnce(self):
+    node_id = self._CheckNodeIdResolvedOnce(self.master.uuid, False)
+    self.assertEqual(node_id, self.master.uuid)
+
+  def testNodeNameResolvedOnce(self):
+    node_id = self._CheckNodeIdResolvedOnce(self.master.name, True)
+    self.assertEqual(node_id, self.master.name)
+
+  def _CheckAddSuccessfulNodes(self, use_node_names):
+    node1 = self.cfg.AddNewNode()
+    node2 = self.cfg.AddNewNode()
+    items = [
+      (self.master.uuid, {"key": "value"}),
+      (node1.name, None),
+      (node2, {"other_key": "other_value"}),
+      ]
+
+    expected = RpcResultsBuilder(cfg=self.cfg, use_node_names=use_node_names)
+    for (node, data) in items:
+      expected.AddSuccessfulNode(node, data)
+    expected = expected.Build()
+
+    builder = RpcResultsBuilder(cfg=self.cfg, use_node_names=use_node_names)
+    with mock.patch.object(self.cfg, "GetNodeInfo",
+                           wraps=self.cfg.GetNodeInfo) as get_node_info:
+      with mock.patch.object(self.cfg, "GetNodeInfoByName",
+                             wraps=self.cfg.GetNodeInfoByName) as get_by_name:
+        result = builder.AddSuccessfulNodes(items).Build()
+
+    self.assertFalse(get_node_info.called)
+    self.assertFalse(get_by_name.called)
+
+    self.assertEqual(sorted(result), sorted(expected))
+    for (node_id, node_result) in result.items():
+      self.assertEqual(node_result.node, expected[node_id].node)
+      self.assertEqual(node_result.data, expected[node_id].data)
+      self.assertEqual(node_result.payload, expected[node_id].payload)
+      self.assertEqual(node_result.fail_msg, expected[node_id].fail_msg)
+
+  def testAddSuccessfulNodesByUuid(self):
+    self._CheckAddSuccessfulNodes(False)
+
+  def testAddSuccessfulNodesByName(self):
+    self._CheckAddSuccessfulNodes(True)
+
+  def testAddSuccessfulNodesUnknownNode(self):
+    builder = RpcResultsBuilder(cfg=self.cfg)
+
+    self.assertRaises(AssertionError, builder.AddSuccessfulNodes,
+                      [(self.master.uuid, None), ("no-such-node", None)])
+
+
+if __name__ == "__main__":
+  testutils.GanetiTestProgram()
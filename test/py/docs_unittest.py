@@ -50,6 +50,8 @@ import testutils
 
 
 VALID_URI_RE = re.compile(r"^[-/a-z0-9]*$")
+HOOK_DIRECTORY_PREFIX = ":directory:"
+HOOK_OPCODE_RE = re.compile(r"^OP_(?!CODE$).+$", re.M)
 
 RAPI_OPCODE_EXCLUDE = compat.UniqueFrozenset([
   # Not yet implemented
@@ -116,12 +118,13 @@ class TestHooksDocs(unittest.TestCase):
     assert len(lu2opcode) == len(mcpu.Processor.DISPATCH_TABLE), \
       "Found duplicate entries"
 
-    hooks_paths = frozenset(re.findall("^:directory:\s*(.+)\s*$", hooksdoc,
-                                       re.M))
+    hooks_paths = frozenset(line[len(HOOK_DIRECTORY_PREFIX):].strip()
+                            for line in hooksdoc.splitlines()
+                            if line.startswith(HOOK_DIRECTORY_PREFIX))
     self.assertTrue(self.HOOK_PATH_OK.issubset(hooks_paths),
                     msg="Whitelisted path not found in documentation")
 
-    raw_hooks_ops = re.findall("^OP_(?!CODE$).+$", hooksdoc, re.M)
+    raw_hooks_ops = HOOK_OPCODE_RE.findall(hooksdoc)
     hooks_ops = set()
     duplicate_ops = set()
     for op in raw_hooks_ops:
@@ -141,15 +144,11 @@ class TestHooksDocs(unittest.TestCase):
                      msg="Found duplicated hook documentation: %s" %
                          utils.CommaJoin(duplicate_ops))
 
-    for name in dir(cmdlib):
-      lucls = getattr(cmdlib, name)
-
+    for lucls in vars(cmdlib).values():
       if (isinstance(lucls, type) and
           issubclass(lucls, cmdlib.LogicalUnit) and
-          hasattr(lucls, "HPATH")):
-        if lucls.HTYPE is None:
-          continue
-
+          hasattr(lucls, "HPATH") and
+          lucls.HTYPE is not None):
         opcls = lu2opcode.get(lucls, None)
 
         if opcls: